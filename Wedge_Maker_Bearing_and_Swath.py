@@ -44,21 +44,23 @@ or arcband as specified by the user's input.
 METHODOLOGY: The tool reads the input points and extracts their coordinates.
 It verifies that the required input fields exist and that the entries are
 in the proper format.  It also verifies the optional inner radius field if
-the user includes it.  The tool then creates a nested list of all of the
-attributes of each wedge and processes it.  For each wedge, the tool
-buffers the point by the outer radius and then creates a triangle emanating
-from the point.  The triangle is then used to clip or erase from the circle
-as appropriate.  If the angle between the two lines of bearing is between
-135 and 225 degrees, the tool creates two smaller wedges and dissolves them
-together because angles close to 180 degrees require extremely large
-triangles, and the math may produce invalid coordinates.  In particular,
-the triangle method fails completely with a 180-degree wedge.
-
-For each wedge, the tool then checks whether the user wanted an arcband.
-If so, the tool re-buffers the point by the inner radius and uses this
-new, smaller circle to erase from the wedge.  The tool combines all of the
-wedges into a single feature class and performs a table join from the
-original feature class to carry over the attributes.
+the user includes it.  The tool then reads each attribute of every wedge
+into a NumPy array of its own, one array per attribute, and processes the
+wedges from those arrays.  For each wedge, the tool creates one or more
+adjacent triangles emanating from the point.  If the angle between the two
+lines of bearing is more than 170 degrees, the tool uses two triangles,
+and if it is more than 340 degrees, three, because angles close to 180
+degrees require extremely large triangles, and the math may produce invalid
+coordinates.  In particular, the triangle method fails completely with a
+180-degree wedge.
+
+The tool buffers each point by its outer radius and, unless the user
+wanted a full circle, clips the circle by the triangles of its own wedge.
+For each point where the user wanted an arcband, the tool also buffers the
+point by the inner radius and erases that smaller circle from the wedge.
+The tool writes the wedges into a single feature class as they are made
+and performs a table join from the original feature class to carry over
+the attributes.
 
 The tool assumes that when the user's lines of bearing are identical,
 no wedge should be created at all, but when the user's lines of bearing
@@ -82,9 +84,53 @@ tool detects this case and skips that wedge as a 0-degree wedge.  If the user
 specifies start and end lines of bearing that differ by a multiple of 360
 degrees e.g. the user specifies "120" and "480" or "-30" and "690" as the lines
 of bearing, then the tool will create a full circle shape.
+
+For large inputs, the wedges can be made by several worker processes at once
+by setting the WEDGE_MAKER_PROCESSES environment variable to the number of
+processes to use, or to 0 to use one process per CPU.
 """
 
-import arcinfo, arcpy, traceback, math, os, sys
+from __future__ import print_function
+
+import arcinfo, arcpy, traceback, numpy, os, sys, json, multiprocessing
+
+#Conversion factors from each of the units of distance accepted in the radius
+#fields to meters
+UNIT_TO_METERS = {"CENTIMETERS": 0.01,
+                  "DECIMETERS": 0.1,
+                  "FEET": 0.3048,
+                  "INCHES": 0.0254,
+                  "KILOMETERS": 1000.0,
+                  "METERS": 1.0,
+                  "MILES": 1609.344,
+                  "MILLIMETERS": 0.001,
+                  "NAUTICALMILES": 1852.0,
+                  "YARDS": 0.9144}
+
+#Positive infinity, the exclusive upper bound of a valid radius distance
+INFINITY = float("inf")
+
+#The widest angle, in degrees, of any one clip triangle.  A wider wedge is
+#split into two or three adjacent triangles, so this must be at least 120.
+MAX_TRIANGLE_ANGLE = 170.0
+
+#The field types of the input fields, grouped by the kind of value they hold
+NUMERIC_FIELD_TYPES = frozenset(['SmallInteger','Integer','Single','Double',
+                                 'Float'])
+TEXT_FIELD_TYPES = frozenset(['String'])
+
+#The environment variable that sets how many worker processes make the wedges.
+#The wedges are made in the tool's own process unless it is set to more than
+#1, or to 0 to use one process per CPU.
+PROCESSES_VARIABLE = "WEDGE_MAKER_PROCESSES"
+
+#The most wedges handed to a worker process at a time.  Each worker gets about
+#four batches, so the batches grow with the number of wedges up to this size.
+MAX_WEDGES_PER_BATCH = 5000
+
+#The projection of the output feature class in a worker process, loaded once
+#by initializeWorker when the worker starts
+workerProjOut = None
 
 
 def printMessage(strMessage, messageType=0):
@@ -95,503 +141,528 @@ def printMessage(strMessage, messageType=0):
     script is being run.
     """
 
-    try:
-        print(strMessage)
-        if messageType == 0:
-            arcpy.AddMessage(strMessage)
-        elif messageType == 1:
-            arcpy.AddWarning(strMessage)
-        elif messageType == 2:
-            arcpy.AddError(strMessage)
-
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
-
-
-def createOneWedge(centerX, centerY, r, firstAngle,
-                   secondAngle, outWedgeName, projOut):
-
-    """createOneWedge creates a single wedge feature class based upon input
-    parameters.  It performs trigonometric calculations to determine the
-    vertices of the Clip/Erase triangle, creates the circle and triangle
-    geometry, and performs the necessary Clip/Erase to generate the wedge/
-    Pac-Man shape.  Returns a string with the location of the output wedge.
+    print(strMessage)
+    if messageType == 0:
+        arcpy.AddMessage(strMessage)
+    elif messageType == 1:
+        arcpy.AddWarning(strMessage)
+    elif messageType == 2:
+        arcpy.AddError(strMessage)
+
+
+def createClipTriangle(centerX, centerY, ptAX, ptAY, ptBX, ptBY, projOut):
+
+    """createClipTriangle creates the geometry of a single clip triangle
+    emanating from the center of a wedge, using the triangle vertices
+    precomputed by createWedges.  Returns the triangle as an arcpy.Polygon.
 
     Keyword arguments:
     centerX -- The X coordinate of the center of the wedge (int or float)
     centerY -- The Y coordinate of the center of the wedge (int or float)
-    r       -- The outer radius of the wedge (int or float)
-    firstAngle -- The line of bearing of the start angle of the wedge (int or
-    float)
-    secondAnge -- The line of bearing of the end angle of the wedge (int or
-    float)
-    outWedgeName -- The path and name of the wedge to be created (string)
-    projOut      -- The projection of the wedge to be created
+    ptAX    -- The X coordinate of the triangle vertex on the triangle's start
+    line of bearing (float)
+    ptAY    -- The Y coordinate of the triangle vertex on the triangle's start
+    line of bearing (float)
+    ptBX    -- The X coordinate of the triangle vertex on the triangle's end
+    line of bearing (float)
+    ptBY    -- The Y coordinate of the triangle vertex on the triangle's end
+    line of bearing (float)
+    projOut -- The projection of the triangle to be created
     (arcpy.SpatialReference)
-
-    firstAngle and secondAngle must fall in the range [0, 360).  r must be
-    greater than 0 and must be in meters.
     """
 
-    try:
-        #theta is the angle between the two lines of bearing.  It will be used
-        #in #calculations and to determine whether to intersect the circle
-        #with the triangle or to clip the circle with the triangle.
-        theta = secondAngle - firstAngle
-
-        #If theta is less than 180 degrees, we'll use the triangle we're
-        #creating to clip the circle and create our wedge.  If theta is
-        #greater than 180 degrees, we'll use the triangle we're creating
-        #to erase from the circle, keeping the larger "Pac-Man" shape
-        #that remains.  In this particular script, if the user's inputted
-        #theta is between 135 degrees and 225 degrees, the script instead
-        #calls this createOneWedge function twice and forms two adjacent
-        #smaller wedges for merging and dissolving.  The reason is that
-        #the clip triangle becomes too large when the wedge angle is
-        #too close to 180 degrees.
-        if theta % 360 > 180:
-            booEraseWedge = True
-        else:
-            booEraseWedge = False
-
-        
-        #Now switch to radians because Python's trigonometric functions
-        #operate on radians instead of degrees.
-        firstAngle = math.radians(firstAngle)
-        secondAngle = math.radians(secondAngle)
-        theta = math.radians(theta)
-
-        #Explanation of "hyp" variable: Imagine a circle and the two lines
-        #of bearing extending out from the circle center.  The angle between
-        #these two lines is theta, as mentioned above.  Bisect theta with the
-        #radius of the circle that falls exactly halfway between the two lines
-        #of bearing.  Now draw the infinite line that is tangent to the circle
-        #at the point where it intersects the circle radius that bisects theta.
-        #Extend either line of bearing until it intersects this infinite line.
-
-        #The triangle formed by the circle radius, the infinite tangent line,
-        #and the extended line of bearing (as described above) is a right
-        #triangle with the right angle being between the circle radius and the
-        #infinite tangent line.  The hypotenuse is the extended line of bearing.
-        #The other known angle of this triangle is the angle between the circle
-        #radius and the extended line of bearing.  This angle is theta/2 because
-        #the radius bisects the angle theta.  The radius is the known length of
-        #the triangle because it's just a radius of the circle.
-
-        #The equation below uses the known values "r" and "theta" and the cosine
-        #function to calculate the length of that hypotenuse, the distance from
-        #the center of the circle to the end of the extended line of bearing.
-        hyp = math.fabs(r / math.cos(theta/2))
-
-        #Using right triangle trigonometry, the code below calculates the X and
-        #Y coordinates of the endpoint of the hypotenuse mentioned above.  The
-        #radius that bisects theta creates two right triangles, one on each
-        #side.  Therefore, the code below calculates the endpoint of the two
-        #hypotenuses of those two triangles.  These two endpoints and the circle
-        #center point form the triangle which we will use in either a clip or an
-        #erase function later to form the desired wedge.
-        ptAX = centerX + math.fabs(hyp) * math.sin(firstAngle)
-        ptAY = centerY + math.fabs(hyp) * math.cos(firstAngle)
-        ptBX = centerX + math.fabs(hyp) * math.sin(secondAngle)
-        ptBY = centerY + math.fabs(hyp) * math.cos(secondAngle)
-
-        #Now create the clip/erase triangle from its points        
-        pt = arcpy.Point()
-
-        #The array object will hold the circle center point and the two
-        #triangle end points.  It will be used to create the triangle
-        #shapefile.        
-        array = arcpy.Array()
-
-        #Build the first vertex of the clip/erase triangle from the center point
-        #of the wedge
-        pt.X = centerX
-        pt.Y = centerY
-
-        #Create a pointGeometry out of the arcpy.Point object, then add the
-        #pointGeometry object to the list that will be used in the
-        #CopyFeatures_management geoprocessor tool below.
-        pointGeometry = arcpy.PointGeometry(pt, projOut)
-
-        #Make a list with the center point in order to create a feature class
-        #with just this one point.  This feature class will be buffered later
-        #to create the circle.      
-        centerList = []
-        centerList.append(pointGeometry)
-
-        #Add the circle center point and the other triangle points to the array
-        #and then add it to the triangleList for use in the
-        #CopyFeatures_management tool below.
-        array.add(pt)
-
-        #Add the two other clip/erase triangle vertices to array
-        pt.X = ptAX
-        pt.Y = ptAY
-        array.add(pt)
-        pt.X = ptBX
-        pt.Y = ptBY
-        array.add(pt)
-        
-        #Close the clip/erase triangle by adding the first vertex to the end of
-        #the array
-        array.add(array.getObject(0))
-
-        #Make a Polygon object out of the array of point objects, then add it to
-        #a list so that the list can be used in the geoprocessing tools below
-        polygon = arcpy.Polygon(array, projOut)
-        triangleList = []
-        triangleList.append(polygon)
-
-        #Buffer the center points by the correct distances
-        circle = "in_memory\\circle"
-        arcpy.Buffer_analysis(centerList, circle, str(r) + ' METERS')
-
-        #If theta is greater than 180 degrees, erase the triangle from the
-        #circle to get a Pac-Man shape.  If not, clip the circle with the
-        #triangle and get the wedge shape.
-
-        #In the special case where theta is a multiple of 360 (and greater than
-        #0) don't do any erasing or clipping.  Just copy the circle feature over
-        #to the final output feature class.
-
-        outWedge = "in_memory\\" + outWedgeName
-
-        if (secondAngle - firstAngle) % 360 != 0:
-            if booEraseWedge == True:
-                arcpy.Erase_analysis(circle, triangleList, outWedge, "")
-            else:
-                arcpy.Clip_analysis(circle, triangleList, outWedge, "")
-        else:
-            arcpy.CopyFeatures_management(circle, outWedge)
+    #Create the clip triangle from its points: the center point of the
+    #wedge, the two other vertices, and the center point again to close
+    #the triangle.  Each vertex gets its own arcpy.Point object so that no
+    #vertex of the array can change when another one is set.
+    array = arcpy.Array([arcpy.Point(centerX, centerY),
+                         arcpy.Point(ptAX, ptAY),
+                         arcpy.Point(ptBX, ptBY),
+                         arcpy.Point(centerX, centerY)])
+
+    #Make a Polygon object out of the array of point objects and return it
+    return arcpy.Polygon(array, projOut)
 
-        #Remove the BUFF_DIST field from outWedge
-        arcpy.DeleteField_management(outWedge, 'BUFF_DIST')
 
-        arcpy.Delete_management(circle)
-        del triangleList
-        
-        #Return the string containing the location and name of the output wedge
-        return outWedge
+def calculateTriangleVertices(centerXArray, centerYArray, angleAArray,
+                              angleBArray, rArray):
 
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
-        
+    """calculateTriangleVertices performs the trigonometric calculations that
+    determine the vertices of the clip triangles of a set of wedges.  It works
+    on whole NumPy arrays of wedge attributes at once and makes no ArcGIS
+    calls, so it stays separate from the geometry construction in
+    createWedges.  Returns a tuple of four NumPy arrays: the angle between the
+    two lines of bearing of each wedge in degrees (360 for a full circle and
+    0 for a wedge to be skipped), the number of clip triangles that make up
+    each wedge, and the X and Y coordinates of the triangle vertices.  Row k
+    of the coordinate arrays holds vertex k of every wedge.
+
+    Keyword arguments:
+    centerXArray -- The X coordinates of the centers of the wedges
+    (numpy.ndarray)
+    centerYArray -- The Y coordinates of the centers of the wedges
+    (numpy.ndarray)
+    angleAArray  -- The start lines of bearing of the wedges (numpy.ndarray)
+    angleBArray  -- The end lines of bearing of the wedges (numpy.ndarray)
+    rArray       -- The outer radii of the wedges (numpy.ndarray)
+
+    The radii must be greater than 0 and must be in the same linear unit as
+    the coordinates of the centers.
+    """
 
-def parseRadius(textRadius, sInputUnits):
+    #Calculate the difference between the two angles, reduced to a range
+    #between 0 (inclusive) and 360 (exclusive).  Reducing the difference
+    #directly gives the same result as reducing both angles first.
+    diffArray = angleBArray - angleAArray
+    thetaArray = numpy.mod(diffArray, 360)
+
+    #If the user enters two lines of bearing that are identical, skip
+    #that wedge entirely, but if the user enters two lines of bearing
+    #that differ by a multiple of 360 degrees, make a complete circle,
+    #instead.  A complete circle is treated as a 360-degree wedge.
+    fullCircleArray = (thetaArray == 0) & (diffArray != 0)
+    thetaArray = numpy.where(fullCircleArray, 360, thetaArray)
+
+    #Reduce the start angle to a range between 0 (inclusive) and 360
+    #(exclusive).  The end angle isn't needed past this point because
+    #every vertex is measured from the start angle.
+    angleAArray = numpy.mod(angleAArray, 360)
+
+    #Split each wedge into as few adjacent clip triangles as possible while
+    #keeping every triangle's angle at MAX_TRIANGLE_ANGLE or less, because
+    #the clip triangle becomes too large when its angle is too close to
+    #180 degrees.  A wedge to be skipped still gets one triangle so that
+    #its triangle's angle is 0 rather than undefined.
+    triangleCountArray = numpy.maximum(
+        numpy.ceil(thetaArray / MAX_TRIANGLE_ANGLE), 1).astype(int)
+    triangleThetaArray = thetaArray / triangleCountArray
+
+    #Explanation of "hyp" variable: Imagine a circle and the two lines
+    #of bearing of one clip triangle extending out from the circle center.
+    #The angle between these two lines is the triangle's angle (theta, in
+    #the case of a wedge made of a single triangle).  Bisect that angle
+    #with the radius of the circle that falls exactly halfway between the
+    #two lines of bearing.  Now draw the infinite line that is tangent to
+    #the circle at the point where it intersects the circle radius that
+    #bisects the angle.  Extend either line of bearing until it intersects
+    #this infinite line.
+
+    #The triangle formed by the circle radius, the infinite tangent line,
+    #and the extended line of bearing (as described above) is a right
+    #triangle with the right angle being between the circle radius and the
+    #infinite tangent line.  The hypotenuse is the extended line of bearing.
+    #The other known angle of this triangle is the angle between the circle
+    #radius and the extended line of bearing.  This angle is half of the
+    #clip triangle's angle because the radius bisects it.  The radius is
+    #the known length of the triangle because it's just a radius of the
+    #circle.
+
+    #The equation below uses the known values "r" and the triangle's angle
+    #and the cosine function to calculate the length of that hypotenuse,
+    #the distance from the center of the circle to the end of the extended
+    #line of bearing.  Python's trigonometric functions operate on radians
+    #instead of degrees, so convert the angles first.  No clip triangle is
+    #wider than MAX_TRIANGLE_ANGLE, so the cosine is never smaller than
+    #cos(85 degrees), and the hypotenuse is always positive and at most
+    #about 11.5 times the radius.
+    angleAArray = numpy.deg2rad(angleAArray)
+    triangleThetaArray = numpy.deg2rad(triangleThetaArray)
+    hypArray = rArray / numpy.cos(triangleThetaArray/2)
+
+    #Using right triangle trigonometry, the code below calculates the X and
+    #Y coordinates of the endpoints of the hypotenuses mentioned above.
+    #The clip triangles of a wedge are laid side by side starting from the
+    #wedge's start line of bearing, so the lines of bearing of their
+    #vertices are spaced evenly, one triangle's angle apart.  Row k of the
+    #coordinate arrays holds vertex k of every wedge, and clip triangle k
+    #of a wedge is formed by the circle center point and vertices k and
+    #k + 1.
+    vertexAngleArray = angleAArray + \
+                       numpy.arange(4).reshape(4, 1) * triangleThetaArray
+
+    ptXArray = centerXArray + hypArray * numpy.sin(vertexAngleArray)
+    ptYArray = centerYArray + hypArray * numpy.cos(vertexAngleArray)
+
+    return thetaArray, triangleCountArray, ptXArray, ptYArray
+
+
+def parseRadius(textRadius):
 
     """parseRadius checks whether the radius information (distance and units)
     has been properly entered into the attribute table.  It splits the input
     text and checks whether there are two parts (presumably the distance and the
-    units.)  If successful, it then checks whether the distance part is
-    actually a number and then whether the units part matches standard ESRI
-    formatting because this radius information will be used as direct input
-    into subsequent ArcGIS Buffer tool commands.  If any of the checks fail,
-    the procedure returns a "None" value.
+    units.)  If successful, it then checks whether the distance part is a
+    real, non-negative number and whether the units part is one of the
+    standard ESRI units of distance.  If all of the checks pass, the procedure
+    returns the distance converted to meters, and otherwise it returns a
+    "None" value.
 
     Keyword arguments:
     textRadius  -- A distance in the format "X UNITS", where X is a real number
     and UNITS is one of these unit types: "CENTIMETERS", "DECIMETERS", "FEET",
     "INCHES", "KILOMETERS", "METERS", "MILES", "MILLIMETERS", "NAUTICALMILES",
     "YARDS" (string)
-    sInputUnits -- A string indicating the units from which to convert the
-    length found in textRadius (string)
     """
 
+    radiusParts = textRadius.split()
+
+    #We need two parts to the radius: the number and the units
+    if len(radiusParts) != 2:
+        return None
+
+    #Make sure the number part is a real, non-negative number.  float()
+    #rejects anything that isn't a number, but it also accepts signs and
+    #special values that can't be used as a radius, so check for those.
     try:
-        radiusParts = textRadius.split()
+        distance = float(radiusParts[0])
+    except ValueError:
+        return None
 
-        #We need two parts to the radius: the number and the units
-        if len(radiusParts) != 2:
-            return None
+    if not 0 <= distance < INFINITY:
+        return None
 
-        #Make sure we have all digits or a single decimal point in the number
-        #part
-        foundDecimalPoint = False
+    #Make sure the units are all valid and spelled correctly.  If the
+    #radius entry is valid, convert it to meters because subsequent
+    #calculations will be done in meters.
+    factor = UNIT_TO_METERS.get(radiusParts[1].upper())
 
-        for digit in radiusParts[0]:
-            #If we find a decimal point, make sure we don't have more than one
-            if digit == ".":
-                if foundDecimalPoint == False:
-                    foundDecimalPoint = True
-                else:
-                    return None
-            elif digit.isdigit() == False:
-                return None
-
-        #Make sure the units are all valid and spelled correctly
-        if str(radiusParts[1]).upper() not in ["CENTIMETERS","DECIMETERS",
-                                               "FEET","INCHES","KILOMETERS",
-                                               "METERS","MILES","MILLIMETERS",
-                                               "NAUTICALMILES","YARDS"]:
-            return None
-
-        #If the radius entry is valid, convert it to meters because subsequent
-        #calculations will be done in meters
-        if str(radiusParts[1]).upper() == "CENTIMETERS":
-            radius = float(radiusParts[0])*0.01
-        elif str(radiusParts[1]).upper() == "DECIMETERS":
-            radius = float(radiusParts[0])*0.1
-        elif str(radiusParts[1]).upper() == "FEET":
-            radius = float(radiusParts[0])*0.3048
-        elif str(radiusParts[1]).upper() == "INCHES":
-            radius = float(radiusParts[0])*0.0254
-        elif str(radiusParts[1]).upper() == "KILOMETERS":
-            radius = float(radiusParts[0])*1000
-        elif str(radiusParts[1]).upper() == "METERS":
-            radius = float(radiusParts[0])*1
-        elif str(radiusParts[1]).upper() == "MILES":
-            radius = float(radiusParts[0])*1609.344
-        elif str(radiusParts[1]).upper() == "MILLIMETERS":
-            radius = float(radiusParts[0])*.001
-        elif str(radiusParts[1]).upper() == "NAUTICALMILES":
-            radius = float(radiusParts[0])*1852
-        elif str(radiusParts[1]).upper() == "YARDS":
-            radius = float(radiusParts[0])*0.9144
-        elif sInputUnits == 'Foot_US':
-            radius = float(radius)*3.2808399
-
-        return radius
-
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
-        
-
-def innerWedgeErase(centerX, centerY, r2, wedge, projOut):
-
-    """Cut out the inner part of the wedge based upon the original point feature
-    class's radius2 field.  Returns a string with the location of the output
-    wedge.
+    if factor == None:
+        return None
+
+    return distance * factor
+
+
+def createWedge(centerX, centerY, ptXList, ptYList, r1, r2, projOut):
+
+    """createWedge creates the geometry of a single wedge or arcband from its
+    center, its clip triangle vertices and its radii.  Returns the wedge as an
+    arcpy.Polygon.
 
     Keyword arguments:
     centerX -- The X coordinate of the center of the wedge (int or float)
     centerY -- The Y coordinate of the center of the wedge (int or float)
-    r2      -- The inner radius of the wedge (int or float)
-    wedge   -- A string specifying the location of the wedge feature class or
-    object from which to erase (string)
-    projOut      -- The projection of the wedge (arcpy.SpatialReference)
+    ptXList -- The X coordinates of the wedge's clip triangle vertices, in
+    order from the start line of bearing to the end line of bearing, or an
+    empty list for a full circle (list)
+    ptYList -- The Y coordinates of the wedge's clip triangle vertices, or an
+    empty list for a full circle (list)
+    r1      -- The outer radius of the wedge in the linear unit of projOut
+    (float)
+    r2      -- The inner radius of the wedge in the linear unit of projOut, or
+    None if the wedge is not an arcband (float)
+    projOut -- The projection of the wedge to be created
+    (arcpy.SpatialReference)
+    """
+
+    #Buffer the center of the wedge by the outer radius.  A full circle
+    #needs nothing more.
+    center = arcpy.PointGeometry(arcpy.Point(centerX, centerY), projOut)
+    wedgeGeometry = center.buffer(r1)
+
+    if ptXList:
+        #Combine the wedge's clip triangles into a single clip polygon.
+        #Clip triangle k is formed by the center point and vertices k and
+        #k + 1.
+        clipPolygon = None
+
+        for k in range(len(ptXList) - 1):
+            triangle = createClipTriangle(centerX, centerY, ptXList[k],
+                                          ptYList[k], ptXList[k + 1],
+                                          ptYList[k + 1], projOut)
+            if clipPolygon == None:
+                clipPolygon = triangle
+            else:
+                clipPolygon = clipPolygon.union(triangle)
+
+        #Clip the circle by the clip polygon
+        wedgeGeometry = wedgeGeometry.intersect(clipPolygon, 4)
+
+    #For an arcband, erase the circle made by buffering the center by the
+    #inner radius
+    if r2 != None:
+        wedgeGeometry = wedgeGeometry.difference(center.buffer(r2))
+
+    return wedgeGeometry
 
-    r2 must be greater than 0 and must be in meters.
+
+def iterateWedges(wedgeNumberList, centerXList, centerYList, thetaList,
+                  triangleCountList, ptXLists, ptYLists, r1List, r2List):
+
+    """iterateWedges goes through the wedges in their input order and yields
+    one record for each wedge that is to be made, letting the user know about
+    each wedge that is skipped.  Each record is a tuple of the wedge number,
+    the count of the wedge among all of the input wedges, and a tuple of the
+    arguments to createWedge without projOut.  The records are made one at a
+    time as they are needed rather than all being held at once.
+
+    Keyword arguments:
+    wedgeNumberList   -- The numbers of the wedges (list)
+    centerXList       -- The X coordinates of the centers of the wedges (list)
+    centerYList       -- The Y coordinates of the centers of the wedges (list)
+    thetaList         -- The angles between the two lines of bearing of the
+    wedges, as returned by calculateTriangleVertices (list)
+    triangleCountList -- The numbers of clip triangles of the wedges (list)
+    ptXLists          -- The X coordinates of the clip triangle vertices of
+    each wedge (list of lists)
+    ptYLists          -- The Y coordinates of the clip triangle vertices of
+    each wedge (list of lists)
+    r1List            -- The outer radii of the wedges (list)
+    r2List            -- The inner radii of the wedges, with NaN for a wedge
+    that is not an arcband (list)
     """
-    
-    try:
 
-        #Create an arcpy.Point() object that will be buffered        
-        pt = arcpy.Point()
-        pt.X = centerX
-        pt.Y = centerY
-
-        #Create a pointGeometry out of the arcpy.Point object, then add the
-        #pointGeometry object to the list that will be used in the
-        #CopyFeatures_management geoprocessor tool below.
-        pointGeometry = arcpy.PointGeometry(pt,projOut)
-
-        # Make a list with the center point in order to create a feature class
-        # with just this one point.  This feature class will be buffered later
-        # to create the circle.
-        centerList = []
-        centerList.append(pointGeometry)
-
-        #Buffer the wedge center by the inner radius distance, then use that
-        #buffer to erase from the input wedge
-        circle = "in_memory\\circle"
-        arcpy.Buffer_analysis(centerList, circle, str(r2) + ' METERS')
-        oWedge2 = "in_memory\\oWedge2"
-        arcpy.Erase_analysis(wedge, circle, oWedge2)
-        arcpy.Delete_management(circle)
-        del centerList
-        arcpy.Delete_management(wedge)
-        return oWedge2
-
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
-
-
-def createWedges(attributesList, inputFC, outputFC, outProj):
+    #Process each wedge in turn.  The count of a wedge among all of the
+    #input wedges is i + 1.
+    for i, wedgeNumber in enumerate(wedgeNumberList):
+        #Extract the mandatory information about the wedge
+        centerX = centerXList[i]
+        centerY = centerYList[i]
+        r1 = r1List[i]
+
+        #If the wedge has an inner radius, use it to trim down the
+        #current wedge.  A wedge without one has NaN, which fails the
+        #comparison below just like an inner radius of 0, which doesn't
+        #trim anything.
+        r2 = r2List[i]
+
+        if not r2 > 0:
+            r2 = None
+
+        #If theta = 0 and the user didn't want a full circle to be created
+        #then there is no wedge to be created at all, so just skip it
+        #completely, and let the user know that we've skipped a wedge.
+        #Likewise, nothing is left of an arcband whose inner radius reaches
+        #its outer radius.  A skipped wedge is named by the OID of its input
+        #feature, since features without an outer radius weren't read and so
+        #its position among the rows read may not match the input.
+        if thetaList[i] == 0:
+            printMessage("Skipping wedge for OID %i (0-degree wedge)..." % \
+                         wedgeNumber)
+
+        elif r2 != None and r2 >= r1:
+            printMessage("Skipping wedge for OID %i (inner radius not less " \
+                         "than outer radius)..." % wedgeNumber)
+
+        else:
+            #A full circle is just the buffer of its center, so it
+            #doesn't get any clip triangle vertices
+            if thetaList[i] == 360:
+                ptXList = []
+                ptYList = []
+            else:
+                triangleCount = triangleCountList[i]
+                ptXList = ptXLists[i][:triangleCount + 1]
+                ptYList = ptYLists[i][:triangleCount + 1]
+
+            yield (wedgeNumber, i + 1,
+                   (centerX, centerY, ptXList, ptYList, r1, r2))
+
+
+def initializeWorker(srString):
+
+    """initializeWorker is run once by each worker process when the wedges are
+    made in parallel.  Spatial reference objects can't be passed between
+    processes, so it loads the output projection from a string and keeps it
+    in workerProjOut for every wedge that the worker makes.
+
+    Keyword arguments:
+    srString -- The projection of the output feature class, as returned by
+    arcpy.SpatialReference.exportToString (string)
+    """
+
+    global workerProjOut
+
+    workerProjOut = arcpy.SpatialReference()
+    workerProjOut.loadFromString(srString)
+
+
+def createWedgeJSON(wedgeRecord):
+
+    """createWedgeJSON is run by the worker processes when the wedges are made
+    in parallel.  Geometry objects can't be passed between processes, so it
+    returns the wedge's geometry as an Esri JSON string, along with the wedge
+    number and count that it was given.  The wedge is made in the projection
+    loaded by initializeWorker.
+
+    Keyword arguments:
+    wedgeRecord -- A record from iterateWedges (tuple)
+    """
+
+    wedgeNumber, wedgeCount, wedgeArguments = wedgeRecord
+
+    return (wedgeNumber, wedgeCount,
+            createWedge(*(wedgeArguments + (workerProjOut,))).JSON)
+
+
+def createWedges(wedgeNumberArray, centerXArray, centerYArray, angleAArray,
+                 angleBArray, r1Array, r2Array, outputFC, outProj):
 
     """Create a feature class of wedge/arcband shapes based upon the attribute
-    information in attributesList.
-
-    #attributesList contains a list item for each wedge to be created, read from
-    #the geometry and attributes of the input shapefile.  The order of the items
-    #in the list is centerX, centerY, the first angle (angleA), the second angle
-    #(angleB), the outer (or only) radius, the inner radius (optional), and a
-    #number that counts the wedges as they are made.
-
-    #The procedure passes the necessary information for each wedge onto the
-    #createOneWedge procedure unless the wedge is between 135 and 225 degrees,
-    #in which case it calls createOneWedge twice to make two adjacent wedges
-    #because a wedge between those two degree measures may cause the resulting
-    #clip/erase triangle to be too large for the input projection.  As an
-    #extreme case, a 180-degree wedge would result in the creation of an invalid
-    #clip/erase triangle, while a 179.999 degree wedge, for example, could
-    #result in the creation of an extremely wide clip/erase triangle, one that
-    #ArcGIS may not be able to work with.  After creating the two adjacent
-    #wedges, the tool then merges and dissolves them to make the full wedge.
-    #Once the wedge is made, it checks whether the optional inner radius
-    #parameter is present in the wedge list.  If it is, it creates a circle of
-    #that inner radius and uses it to erase from the wedge, resulting in the
-    #final "arcband."
+    information in the input arrays.
+
+    #The input arrays hold one entry for each wedge to be created, read from
+    #the geometry and attributes of the input shapefile.  Entry i of every
+    #array belongs to the same wedge.
+
+    #The procedure builds a clip polygon for each wedge out of one or more
+    #adjacent clip triangles emanating from the center of the wedge.  A wedge
+    #of up to 170 degrees needs only one triangle.  A wedge of up to 340
+    #degrees is made of two triangles because a single triangle for a wedge
+    #wider than 170 degrees may be too large for the input projection.  As an
+    #extreme case, a 180-degree wedge would result in the creation of an
+    #invalid clip triangle, while a 179.999 degree wedge, for example, could
+    #result in the creation of an extremely wide clip triangle, one that
+    #ArcGIS may not be able to work with.  A wider wedge is made of three
+    #triangles.  A full circle gets no clip triangles at all.
+
+    #The procedure then buffers the center of the wedge by its outer radius
+    #and clips the circle by the wedge's clip polygon.  A full circle is just
+    #the outer buffer, left unclipped.  If the optional inner
+    #radius parameter is present for a wedge, its center is also buffered by
+    #the inner radius, and that inner circle is erased from the wedge to
+    #leave the final "arcband."  Each wedge is written straight into the
+    #output feature class.  If the WEDGE_MAKER_PROCESSES environment variable
+    #asks for it, the wedges are made by a pool of worker processes and
+    #written in their input order as the workers return them.
 
     Keyword arguments:
-    attributesList -- A list of lists.  Each list contains 5 or 6 entries:
-        -- The number of the wedge, used to join the output wedges back up
-        with the input point feature class's attribute table (int)
-        -- The X coordinate of the center of the wedge (int or float)
-        -- The Y coordinate of the center of the wedge (int or float)
-        -- The start line of bearing of the wedge (int or float)
-        -- The end line of bearing of the wedge (int or float)
-        -- The outer radius of the wedge (int or float)
-        -- The inner radius of the wedge (optional) (int or float)
-    inputFC -- The path to the tool's input point feature class (string)
+    wedgeNumberArray -- The numbers of the wedges, used to join the output
+    wedges back up with the input point feature class's attribute table
+    (numpy.ndarray)
+    centerXArray -- The X coordinates of the centers of the wedges
+    (numpy.ndarray)
+    centerYArray -- The Y coordinates of the centers of the wedges
+    (numpy.ndarray)
+    angleAArray -- The start lines of bearing of the wedges (numpy.ndarray)
+    angleBArray -- The end lines of bearing of the wedges (numpy.ndarray)
+    r1Array -- The outer radii of the wedges in meters (numpy.ndarray)
+    r2Array -- The inner radii of the wedges in meters, with NaN for a wedge
+    that is not an arcband (numpy.ndarray)
     outputFC -- The path to the tool's output point feature class (string)
     outProj -- The projection of the output point feature class
     (arcpy.SpatialReference)
     """
 
+    #The radii are in meters, but the geometry objects below work in the
+    #linear unit of the output projection
+    metersPerUnit = outProj.metersPerUnit
+    r1Array = r1Array / metersPerUnit
+    r2Array = r2Array / metersPerUnit
+
+    #Calculate the vertices of every wedge's clip triangles for all of the
+    #wedges at once
+    thetaArray, triangleCountArray, ptXArray, ptYArray = \
+        calculateTriangleVertices(centerXArray, centerYArray, angleAArray,
+                                  angleBArray, r1Array)
+
+    #Turn the results into plain Python lists, one entry (or one list of
+    #vertices) per wedge, in a single step each.  Indexing NumPy arrays
+    #one element at a time inside the loop below is much slower than
+    #indexing lists.
+    wedgeNumberList = wedgeNumberArray.tolist()
+    centerXList = centerXArray.tolist()
+    centerYList = centerYArray.tolist()
+    thetaList = thetaArray.tolist()
+    triangleCountList = triangleCountArray.tolist()
+    r1List = r1Array.tolist()
+    r2List = r2Array.tolist()
+    ptXLists = ptXArray.T.tolist()
+    ptYLists = ptYArray.T.tolist()
+
+    #Create the output feature class with an Id field holding the wedge
+    #number.  This will be used later for the table join with the input
+    #shapefile.  A new shapefile already comes with an Id field, but it is
+    #only six digits wide, so it is replaced with one wide enough for any
+    #wedge number.  A shapefile must always have at least one attribute
+    #field, so a placeholder field stands in while the Id field is replaced.
+    arcpy.CreateFeatureclass_management(os.path.dirname(outputFC),
+                                        os.path.basename(outputFC),
+                                        "POLYGON",
+                                        spatial_reference=outProj)
+    replaceId = bool(arcpy.ListFields(outputFC, "Id"))
+
+    if replaceId:
+        arcpy.AddField_management(outputFC, "WEDGE_TMP", "SHORT")
+        arcpy.DeleteField_management(outputFC, "Id")
+
+    arcpy.AddField_management(outputFC, "Id", "LONG", 10)
+
+    if replaceId:
+        arcpy.DeleteField_management(outputFC, "WEDGE_TMP")
+
+    wedgeTotal = len(wedgeNumberList)
+
+    #Go through the wedges that are to be made one at a time
+    wedgeRecords = iterateWedges(wedgeNumberList, centerXList, centerYList,
+                                 thetaList, triangleCountList, ptXLists,
+                                 ptYLists, r1List, r2List)
+
+    #Find out how many worker processes to make the wedges with
     try:
+        processCount = int(os.environ.get(PROCESSES_VARIABLE, "1"))
+    except ValueError:
+        processCount = 1
+    if processCount == 0:
+        processCount = multiprocessing.cpu_count()
+
+    #Make the wedges in this process, or hand them out to the worker
+    #processes and turn the JSON strings they return back into geometry.
+    #The pool runs the workers with the Python interpreter because inside
+    #ArcMap sys.executable is ArcMap itself.  That setting applies to the
+    #whole ArcMap session, so it is put back once the pool is finished.
+    useWorkers = processCount > 1 and wedgeTotal > 1
+    pool = None
+
+    try:
+        if useWorkers:
+            #The pool reads the records on a thread of its own, so go
+            #through them here first, so that the skipped wedges are
+            #reported from the main thread before any wedges are made
+            wedgeRecords = list(wedgeRecords)
+
+            multiprocessing.set_executable(os.path.join(sys.exec_prefix,
+                                                        "pythonw.exe"))
+            pool = multiprocessing.Pool(processCount, initializeWorker,
+                                        (outProj.exportToString(),))
+            batchSize = min(max(wedgeTotal // (processCount * 4), 1),
+                            MAX_WEDGES_PER_BATCH)
+            wedgeJSONs = pool.imap(createWedgeJSON, wedgeRecords, batchSize)
+            wedges = ((wedgeNumber, wedgeCount,
+                       arcpy.AsShape(json.loads(wedgeJSON), True)) for
+                      wedgeNumber, wedgeCount, wedgeJSON in wedgeJSONs)
+        else:
+            wedges = ((wedgeNumber, wedgeCount,
+                       createWedge(*(wedgeArguments + (outProj,)))) for
+                      wedgeNumber, wedgeCount, wedgeArguments in wedgeRecords)
+
+        #Every wedge is written through a single cursor, opened once on the
+        #output feature class, as soon as it is made.  The cursor releases
+        #its lock on the output when the with block ends, even if a wedge
+        #fails.
+        with arcpy.da.InsertCursor(outputFC, ["SHAPE@", "Id"]) as outputRows:
+            for wedgeNumber, wedgeCount, wedgeGeometry in wedges:
+                printMessage("Creating wedge %i of %i..." % (wedgeCount,
+                                                             wedgeTotal))
+                outputRows.insertRow((wedgeGeometry, wedgeNumber))
+
+    #If anything fails while the wedges are being made, stop the worker
+    #processes right away so that none of them stay alive in the ArcMap
+    #session after the error is reported
+    except Exception:
+        if pool != None:
+            pool.terminate()
+        raise
+
+    else:
+        if pool != None:
+            pool.close()
+
+    finally:
+        if pool != None:
+            pool.join()
+        if useWorkers:
+            multiprocessing.set_executable(sys.executable)
 
-        #Keep track of how many wedges have been processed
-        count = 1
-
-        #Build a list of strings containing the paths to the individual wedge
-        #feature classes that are being made so that they can all be combined
-        #into one final output feature class at the end
-        mergeList = []
-
-        #Process each wedge in turn
-        for wedge in attributesList:
-
-            #Extract the mandatory information about the wedge from its list
-            wedgeNumber = wedge[0]
-            centerX = wedge[1]
-            centerY = wedge[2]
-            angleA = wedge[3]
-            angleB = wedge[4]
-            r1 = wedge[5]
-
-            #If the user enters two lines of bearing that are identical, skip
-            #that wedge entirely, but if the user enters two lines of bearing
-            #that differ by a multiple of 360 degrees, make a complete circle,
-            #instead.  Check whether the user wants a complete circle out of the
-            #current wedge before we start doing math on the lines of bearing.
-            booFullCircle = False
-
-            if (angleB - angleA) % 360 == 0:
-                if angleB != angleA:
-                    booFullCircle = True
-
-            #Reduce the angles to a range between 0 (inclusive) and 360
-            #(exclusive)
-            angleA = angleA % 360
-            angleB = angleB % 360
-
-            #Calculate the difference between the two angles
-            theta = (angleB - angleA) % 360
-
-            #If theta = 0 and the user didn't want a full circle to be created
-            #then there is no wedge to be created at all, so just skip it
-            #completely, but keep track of the count variable for later table
-            #joining purposes, and let the user know that we've skipped a
-            #wedge.
-            if theta == 0 and booFullCircle == False:
-                printMessage("Skipping wedge " + str(count) + \
-                             " (0-degree wedge)...")
-                count += 1
-
-            #If theta is too close to 180 degrees, the triangle math may fail
-            #because the coordinates of the Clip/Erase triangle will become
-            #extremely large in magnitude.  In those cases, make two smaller
-            #wedges and dissolve them together.
-            else:
-                printMessage("Creating wedge " + str(count) + " of " + \
-                             str(len(attributesList))+ "...")
-                if 135 < (theta % 360) < 225:
-
-                    #Create the first wedge
-                    angleB = (angleA + theta/2) % 360
-                    wedge1 = createOneWedge(centerX, centerY, r1, angleA,
-                                            angleB, "WedgeA", outProj)
-
-                    #Create the second wedge
-                    angleA = angleB
-                    angleB = (angleB + theta/2) % 360
-                    wedge2 = createOneWedge(centerX, centerY, r1, angleA,
-                                            angleB, "WedgeB", outProj)
-
-                    #Now merge the two wedges, dissolve, and clean up
-                    arcpy.Merge_management([wedge1, wedge2],
-                                           "in_memory\\WedgeC")
-                    arcpy.Delete_management("in_memory\\WedgeA")
-                    arcpy.Delete_management("in_memory\\WedgeB")
-
-                    oWedge = "in_memory\\oWedge"
-                    arcpy.Dissolve_management("in_memory\\WedgeC", oWedge)
-                    arcpy.Delete_management("in_memory\\WedgeC")
-                   
-                    del wedge1
-                    del wedge2
-                    
-                #If theta is not between 135 and 225 degrees, proceed normally
-                else:
-                    oWedge = createOneWedge(centerX, centerY, r1, angleA,
-                                            angleB, "oWedge", outProj)
-
-                #If there's a second radius field, use it to trim down the
-                #current wedge.  The wedge[6] checks are because if the user
-                #created the radius2 field in a shapefile and didn't fill it for
-                #some or all of the wedges, the field will still be present with
-                #a single space in it.  If that's the case, just ignore the
-                #radius2 field for that particular feature.
-                if len(wedge) == 7 and wedge[6] != None and wedge[6] != '' \
-                   and wedge[6] != ' ':
-                    oWedge = innerWedgeErase(centerX, centerY, wedge[6], oWedge,
-                                             outProj)
-
-                #Now update the new wedge feature class's Id field to keep
-                #count.  This will be used later for the table join with the
-                #input shapefile.
-                arcpy.AddField_management(oWedge, "Id", 'LONG')
-
-                rows = arcpy.da.UpdateCursor(oWedge, "Id")
-
-                for row in rows:
-                    row[0] = wedgeNumber
-                    rows.updateRow(row)
-                del rows
-                count += 1
-
-                #Give the new wedge a unique name in the in_memory workspace and
-                #add it to the list of wedge feature classes to be merged
-                #together at the end
-                nextWedge = "in_memory\\nextWedge" + str(count)
-                arcpy.CopyFeatures_management(oWedge, nextWedge)
-                arcpy.Delete_management(oWedge)
-                mergeList.append(nextWedge)
-                del oWedge
-                del nextWedge
-
-        #Now merge the individual wedge shapefiles into the final feature class
-        printMessage('Merging wedges...')
-        arcpy.Merge_management(mergeList, outputFC)
-
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
-        
 
 def processWedges():
 
@@ -603,38 +674,45 @@ def processWedges():
     try:
         #Input feature class
         inputFC = arcpy.GetParameter(0)
-        #Field containing lines of bearing
-        fieldBearing = arcpy.GetParameterAsText(1)
-        #Field containing swaths
-        fieldSwath = arcpy.GetParameterAsText(2)
-        #Field containing outer wedge/arcband radius length
-        fieldOuterRadius = arcpy.GetParameterAsText(3)
-        #Field containing inner wedge/arcband radius length (if present)
-        fieldInnerRadius = arcpy.GetParameterAsText(4)
-        #Output wedge/arcband feature class
-        outputFC = arcpy.GetParameterAsText(5)
 
         #Due to the nature of the calculations the tool performs, it should not
         #be run on WGS84 data or data with no projection information.
+        #Check this before reading any of the other parameters so that the
+        #tool fails fast on unusable input.  The input is described only
+        #once, and each property of the description that the tool uses is
+        #read only once.
         desc = arcpy.Describe(inputFC)
-        if desc.spatialReference.Name == "Unknown":
-            printMessage("ERROR: Input shapefile does not have projection " + \
+        oidFieldName = desc.OIDFieldName
+        sr = desc.spatialReference
+        srName = sr.Name
+        srUnit = sr.linearUnitName
+
+        if srName == "Unknown":
+            printMessage("ERROR: Input shapefile does not have projection " \
                          "information.",2)
             return
-        elif desc.spatialReference.Name == "GCS_WGS_1984":
-            printMessage("ERROR: Please reproject shapefile to a non-WGS84 " + \
+        elif srName == "GCS_WGS_1984":
+            printMessage("ERROR: Please reproject shapefile to a non-WGS84 " \
                          "projection.",2)
             return
-        elif desc.spatialReference.linearUnitName == "Degree":
-            printMessage("ERROR: Please reproject shapefile from " + \
+        elif srUnit == "Degree":
+            printMessage("ERROR: Please reproject shapefile from " \
                          "geographic coordinates.",2)
             return
 
-        #Counter variable to let the user know about bad input rows
-        count = 1
+        #Field containing lines of bearing
+        fieldBearing = arcpy.GetParameterAsText(1)
+        #Field containing swaths
+        fieldSwath = arcpy.GetParameterAsText(2)
+        #Field containing outer wedge/arcband radius length
+        fieldOuterRadius = arcpy.GetParameterAsText(3)
+        #Field containing inner wedge/arcband radius length (if present)
+        fieldInnerRadius = arcpy.GetParameterAsText(4)
+        #Output wedge/arcband feature class
+        outputFC = arcpy.GetParameterAsText(5)
 
         #Use the same spatial reference as the input feature class
-        outProj = desc.spatialReference
+        outProj = sr
 
         #Check whether the input is a layer from an active ArcMap session or a
         #feature class from disk.  The input has been grabbed as an object
@@ -649,198 +727,250 @@ def processWedges():
         except:
             inputFC = arcpy.GetParameterAsText(0)
 
-        #Check whether the input fields are ok.  Start by assuming that every
-        #required field (or optional field, in the case of "radius2") is
-        #missing until proven otherwise.
-        gotBearing = False
-        gotSwath   = False
-        gotRadius  = False
-        gotRadius2 = False
-
-        #Get the input fields from the input shapefile
+        #Get the input fields from the input shapefile, keyed by name so that
+        #each of the tool's fields can be looked up directly.  The join needs
+        #every field anyway, so this one call to ListFields serves both,
+        #rather than calling it again with each field name as a wildcard.
         fieldList = arcpy.ListFields(inputFC)
+        fieldsByName = dict((field.name, field) for field in fieldList)
+
+        #Check whether the input fields are ok.  Every required field (or
+        #optional field, in the case of "radius2") is missing unless the
+        #input has a field of that name.
+        gotBearing = fieldBearing in fieldsByName
+        gotSwath   = fieldSwath in fieldsByName
+        gotRadius  = fieldOuterRadius in fieldsByName
+        gotRadius2 = fieldInnerRadius in fieldsByName
+
+        #Don't accept the bearing field if it's not of a numeric type
+        if gotBearing:
+            field = fieldsByName[fieldBearing]
+            if field.type not in NUMERIC_FIELD_TYPES:
+                printMessage('Error: Input feature class field %s is not a ' \
+                             'numeric field.' % field.name,2)
+                return
+            bearingFieldName = field.name
+
+        #Don't accept the swath field if it's not of a numeric type
+        if gotSwath:
+            field = fieldsByName[fieldSwath]
+            if field.type not in NUMERIC_FIELD_TYPES:
+                printMessage('Error: Input feature class field %s is not a ' \
+                             'numeric field.' % field.name,2)
+                return
+            swathFieldName = field.name
+
+        #Don't accept the outer radius field if it's not of text type
+        if gotRadius:
+            field = fieldsByName[fieldOuterRadius]
+            if field.type not in TEXT_FIELD_TYPES:
+                printMessage('Error: Input feature class field %s is not a ' \
+                             'text field.' % field.name,2)
+                return
+            r1FieldName = field.name
 
-        for field in fieldList:
-            if field.name == fieldBearing:
-                #Don't accept the first bearing field if it's not of a numeric
-                #type
-                if field.type not in ['SmallInteger','Integer','Single',
-                                      'Double','Float']:
-                    printMessage('Error: Input feature class field ' + \
-                                 field.name + ' is not a numeric field.',2)
-                    return
-                bearingFieldName = field.name
-                gotBearing = True
-
-            elif field.name == fieldSwath:
-                #Don't accept the swath field if it's not of a numeric type
-                if field.type not in ['SmallInteger','Integer','Single',
-                                      'Double','Float']:
-                    printMessage('Error: Input feature class field ' + \
-                                 field.name + ' is not a numeric field.',2)
-                    return
-                swathFieldName = field.name
-                gotSwath = True
-
-            elif field.name == fieldOuterRadius:
-                #Don't accept the outer radius field if it's not of text type
-                if field.type not in ['String']:
-                    printMessage('Error: Input feature class field ' + \
-                                 field.name + ' is not a text field.',2)
-                    return
-                r1FieldName = field.name
-                gotRadius = True
-
-            #The inner radius field isn't strictly necessary, but we need to
-            #know if the field is present because if it is, we have to verify
-            #that its values are valid for input
-            elif field.name == fieldInnerRadius:
-
-                #Don't accept the inner radius field if it's not of text type
-                if field.type not in ['String']:
-                    printMessage('Error: Input shapefile field ' + \
-                                 field.name + ' is not a text field.',2)
-                    return
-                r2FieldName = field.name
-                gotRadius2 = True
-
-        if gotBearing == False:
-            printMessage('ERROR: Input shapefile does not have field for ' + \
+        #The inner radius field isn't strictly necessary, but we need to
+        #know if the field is present because if it is, we have to verify
+        #that its values are valid for input.  Don't accept the inner radius
+        #field if it's not of text type.
+        if gotRadius2:
+            field = fieldsByName[fieldInnerRadius]
+            if field.type not in TEXT_FIELD_TYPES:
+                printMessage('Error: Input shapefile field %s is not a ' \
+                             'text field.' % field.name,2)
+                return
+            r2FieldName = field.name
+
+        if not gotBearing:
+            printMessage('ERROR: Input shapefile does not have field for ' \
                          'line of bearing.',2)
             return
 
-        elif gotSwath == False:
-            printMessage('ERROR: Input shapefile does not have field for ' + \
+        elif not gotSwath:
+            printMessage('ERROR: Input shapefile does not have field for ' \
                          'swath.',2)
             return
                                       
-        elif gotRadius == False:
-            printMessage('ERROR: Input shapefile does not have field for ' + \
+        elif not gotRadius:
+            printMessage('ERROR: Input shapefile does not have field for ' \
                          'radius.',2)
             return
 
-        #Attributes in attributeList are stored in this order: centerX, centerY,
-        #angleA, angleB, r1, wedgeNumber, r2 (optional).  Check for formatting
-        #errors in the radius field(s) before proceeding.  Because this tool,
-        #which accepts line of bearing and swath as input, is built upon the
-        #previous version of the tool, which expects two lines of bearing as
-        #input, this tool simply translates line of bearing and swath into two
-        #lines of bearing and then passes those values to the remainder of the
-        #code for processing.
+        #Read the wedge number, centerX, centerY, angleA, angleB, r1 and r2
+        #(optional) of every wedge.  Check for formatting errors in the radius
+        #field(s) before proceeding.  Because this tool, which accepts line of
+        #bearing and swath as input, is built upon the previous version of the
+        #tool, which expects two lines of bearing as input, this tool simply
+        #translates line of bearing and swath into two lines of bearing and
+        #then passes those values to the remainder of the code for processing.
+
+        #All of the rows are read in one pass into a NumPy array with one
+        #column per field, and the X and Y coordinates of each point in
+        #columns of their own.  A null inner radius is read as an empty
+        #string, which is then treated like any other blank inner radius.
+        readFieldList = ["OID@", "SHAPE@X", "SHAPE@Y", bearingFieldName,
+                         swathFieldName, r1FieldName]
+        nullValues = {}
 
-        #Lists to hold all of the wedge/arcband attributes
-        attributesList = []
+        if gotRadius2:
+            readFieldList.append(r2FieldName)
+            nullValues[r2FieldName] = ""
+
+        #A feature without an outer radius has no wedge to make, so the
+        #where clause leaves it out before it is ever read.  An unfilled text
+        #field in a shapefile comes back as a space, so any outer radius
+        #that is all whitespace is dropped right after the read.
+        r1Delimited = arcpy.AddFieldDelimiters(inputFC, r1FieldName)
+        whereClause = "%s IS NOT NULL AND %s <> ''" % (r1Delimited,
+                                                        r1Delimited)
+
+        inputArray = arcpy.da.FeatureClassToNumPyArray(inputFC, readFieldList,
+                                                       whereClause,
+                                                       null_value=nullValues)
+
+        blankRows = numpy.array([not textRadius.strip() for
+                                 textRadius in inputArray[r1FieldName]],
+                                bool)
+
+        if blankRows.any():
+            inputArray = inputArray[~blankRows]
+
+        #Let the user know how many features were left out
+        skipCount = int(arcpy.GetCount_management(inputFC).getOutput(0)) - \
+                    len(inputArray)
+
+        if skipCount > 0:
+            printMessage("Skipping %i feature(s) with no outer radius..." % \
+                         skipCount, 1)
+
+        #Parse the radius column(s) to get the distances in meters.  A
+        #badly formatted radius is parsed as None.  A missing or blank (all
+        #whitespace) inner radius is stored as NaN.
+        r1Array = numpy.array([parseRadius(textRadius) for
+                               textRadius in inputArray[r1FieldName]],
+                              object)
+        radiusColumnList = [(fieldOuterRadius, r1Array)]
 
         if gotRadius2:
-            rows = arcpy.da.SearchCursor(inputFC, ["OID@", "SHAPE@XY",
-                                                   bearingFieldName,
-                                                   swathFieldName, r1FieldName,
-                                                   r2FieldName])
+            r2Array = numpy.array([numpy.nan if not textRadius.strip() else
+                                   parseRadius(textRadius) for
+                                   textRadius in inputArray[r2FieldName]],
+                                  object)
+            radiusColumnList.append((fieldInnerRadius, r2Array))
+
+        #Without an inner radius field, the inner radius column is allocated
+        #once at its full size and filled with NaN
         else:
-            rows = arcpy.da.SearchCursor(inputFC, ["OID@", "SHAPE@XY",
-                                                   bearingFieldName,
-                                                   swathFieldName,
-                                                   r1FieldName])
-
-        for row in rows:
-            #List to hold the attributes of one wedge/arcband
-            oneAttributeSetList = []
-
-            #Grab the feature ID, X coordinate, and Y coordinate
-            oneAttributeSetList.append(row[0])
-            oneAttributeSetList.append(row[1][0])
-            oneAttributeSetList.append(row[1][1])
-
-            #Get the bearing and swath and use them to calculate the two angles
-            bearing = row[2]
-            swath = row[3]/2
-
-            oneAttributeSetList.append(bearing - swath)
-            oneAttributeSetList.append(bearing + swath)
-
-            #Grab the radius and parse it to return the distance in meters
-            r1 = parseRadius(row[4], desc.spatialReference.linearUnitName)
-
-            #Make sure the radius field is formatted properly
-            if r1 == None:
-                printMessage('ERROR: Input formatting error in ' + \
-                             fieldOuterRadius + ' field, feature ' + str(count) + ".",2)
-                return
-            oneAttributeSetList.append(r1)
-
-            #Make sure the radius2 field is formatted properly if present.  If
-            #it is properly formatted, add it to the current wedge/arcband's
-            #attribute list.
-            if gotRadius2 == True:
-                if row[5] in ['',' ']:
-                    r2 = ''
-                else:
-                    r2 = parseRadius(row[5],
-                                     desc.spatialReference.linearUnitName)
-                if r2 == None:
-                    printMessage('ERROR: Input formatting error in ' + \
-                                 fieldInnerRadius + ' field, feature ' + \
-                                 str(count) + ".",2)
-                    return
-                oneAttributeSetList.append(r2)
-
-            #Add the attributes from one wedge to attributesList
-            attributesList.append(oneAttributeSetList)
-
-            #Increment the counter
-            count += 1
+            r2Array = numpy.empty(len(r1Array), numpy.float64)
+            r2Array.fill(numpy.nan)
+
+        #Make sure that every radius is formatted properly, checking each
+        #whole column at once.  Report every feature with a badly formatted
+        #radius by its OID, since features without an outer radius weren't
+        #read and so positions among the rows read don't match the input.
+        badRadius = False
+
+        for fieldName, radiusArray in radiusColumnList:
+            badRows = numpy.flatnonzero(numpy.equal(radiusArray, None))
+
+            if badRows.size:
+                printMessage('ERROR: Input formatting error in %s field, ' \
+                             'feature OID(s) %s.' % \
+                             (fieldName,
+                              ', '.join([str(oid) for oid in
+                                         inputArray["OID@"][badRows]])),2)
+                badRadius = True
+
+        if badRadius:
+            return
 
-        del row
-        del rows
+        #Get the bearings and swaths and use them to calculate the two angles
+        #of every wedge
+        bearingArray = inputArray[bearingFieldName].astype(numpy.float64)
+        swathArray = inputArray[swathFieldName] / 2.0
 
         #Create the wedges.  The output will be a feature class in the output
         #location called outputFC.
-        createWedges(attributesList, inputFC, outputFC, outProj)
+        createWedges(inputArray["OID@"],
+                     inputArray["SHAPE@X"],
+                     inputArray["SHAPE@Y"],
+                     bearingArray - swathArray,
+                     bearingArray + swathArray,
+                     r1Array.astype(numpy.float64),
+                     r2Array.astype(numpy.float64),
+                     outputFC, outProj)
 
         #Join the original attribute table to the new wedge shapefile
-        #attribute table.        
-        printMessage('Joining table...')
-
-        #skipFieldList holds all the fields we don't want to join to the new
-        #feature class.  It includes "Shape" as well as the OID field name.
-        skipFieldList = ['Shape', arcpy.Describe(inputFC).OIDFieldName]
-
-        #Build a list of fields to join
-        joinFieldsList = []
+        #attribute table.
+
+        #skipFieldSet holds all the fields we don't want to join to the new
+        #feature class.  It includes "Shape" as well as the OID field name,
+        #and the fields the new feature class already has, such as "Id".
+        skipFieldSet = frozenset(['Shape', oidFieldName] +
+                                 [field.name for field in
+                                  arcpy.ListFields(outputFC)])
+
+        #A shapefile can't store nulls, so in a shapefile output a null
+        #becomes 0 or empty text however the field is joined
+        outputIsShapefile = arcpy.Describe(outputFC).dataType == "ShapeFile"
+
+        #Build two lists of fields to join, keeping the input's field order.
+        #Numeric and text fields are read into a NumPy array and added to the
+        #new feature class in one step, along with the value that stands in
+        #for a null in each of them.  A NumPy array can't hold a null, so
+        #this is only done for fields that can't hold a null or that are
+        #going into a shapefile anyway.  Every other field, such as a date
+        #field or a nullable field going into a geodatabase, is joined with
+        #the Join Field tool, which keeps its nulls.
+        arrayJoinFieldsList = []
+        nullValues = {}
+        toolJoinFieldsList = []
 
         for field in fieldList:
-            if field.name not in skipFieldList:
-                joinFieldsList.append(field.name)
-
-        #Build the parameter for the JoinField_management tool
-        joinFieldsParameter = ";".join(joinFieldsList)
-
-        arcpy.JoinField_management(outputFC, "Id", inputFC,
-                                   arcpy.Describe(inputFC).OIDFieldName,
-                                   joinFieldsParameter)
+            if field.name in skipFieldSet or field.type == 'Geometry':
+                continue
 
-        #We don't need the new "Id_1" or "ORIG_FID" fields
-        arcpy.DeleteField_management(outputFC, "Id_1")
-        arcpy.DeleteField_management(outputFC, "ORIG_FID")
+            if field.type in NUMERIC_FIELD_TYPES | TEXT_FIELD_TYPES and \
+               (outputIsShapefile or not field.isNullable):
+                arrayJoinFieldsList.append(field.name)
 
-    except Exception as e:
-        tb = sys.exc_info()[2]
-        arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-        print str(e)
-        arcpy.AddError(str(e))
+                if field.type in TEXT_FIELD_TYPES:
+                    nullValues[field.name] = ""
+                else:
+                    nullValues[field.name] = 0
+            else:
+                toolJoinFieldsList.append(field.name)
+
+        #An input with no fields left to join is not read again at all
+        if arrayJoinFieldsList or toolJoinFieldsList:
+            printMessage('Joining table...')
+
+        #Read the first list of fields into a NumPy array along with the OID
+        #of each input feature, and add them to the new feature class by
+        #matching the OIDs against the wedge numbers in its Id field
+        if arrayJoinFieldsList:
+            joinArray = arcpy.da.FeatureClassToNumPyArray(
+                inputFC, ["OID@"] + arrayJoinFieldsList, null_value=nullValues)
+            arcpy.da.ExtendTable(outputFC, "Id", joinArray, "OID@")
+
+        if toolJoinFieldsList:
+            arcpy.JoinField_management(outputFC, "Id", inputFC, oidFieldName,
+                                       ";".join(toolJoinFieldsList))
+
+    except Exception:
+        #This is the only exception handler in the tool.  An error raised
+        #anywhere while the wedges are being made ends up here, and its full
+        #traceback is reported once, without its trailing newline.
+        printMessage(traceback.format_exc().rstrip(), 2)
 
 ################################################################################
 
-try:
+#The worker processes import this script, so only run the tool from the main
+#process
+if __name__ == "__main__":
     #Check that the appropriate license level is available to the user
     if arcpy.CheckProduct("arcinfo") != "AlreadyInitialized":
-        printMessage("ERROR: The required ArcGIS for Desktop Advanced " + \
+        printMessage("ERROR: The required ArcGIS for Desktop Advanced " \
                      "license is unavailable.", 2)
     else:
         processWedges()
-
-except Exception as e:
-    tb = sys.exc_info()[2]
-    arcpy.AddError("An error occured on line %i" % tb.tb_lineno)
-    print str(e)
-    arcpy.AddError(str(e))